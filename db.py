@@ -9,56 +9,99 @@ PRODUCTION: Requires DATABASE_URL environment variable.
 """
 
 import os
+import re
+import json
 import hashlib
+import functools
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from psycopg2.pool import ThreadedConnectionPool
 import time
 import logging
 import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Constant-only modules (no db import), safe to load at module level
+from services.scrub_rules import VALID_SCRUB_DECISIONS, SCRUB_FIELD_WHITELIST
+from services.sales_stage import SALES_STAGE_KEYS, SALES_STAGE_LABELS
 
-# Configure logging for instrumentation (server-side only)
+# Instrumentation logger (server-side only). Level/handler are configured once
+# per process by settings.LOGGING, not at import time.
 _logger = logging.getLogger(__name__)
-_logger.setLevel(logging.INFO)
-if not _logger.handlers:
-    _handler = logging.StreamHandler()
-    _handler.setFormatter(logging.Formatter('%(asctime)s [%(name)s] %(message)s'))
-    _logger.addHandler(_handler)
 
 # =============================================================================
 # CONNECTION POOL (lazy-initialized singleton)
 # =============================================================================
+_POOL_MAX_CONN = 10
+_POOL_ACQUIRE_TIMEOUT = 2.0  # seconds
 _pool: Optional[ThreadedConnectionPool] = None
 _pool_lock = threading.Lock()
+# One permit per pooled connection: waiters block here and are woken as soon
+# as a connection is returned, instead of sleep-polling pool.getconn().
+_pool_slots = threading.BoundedSemaphore(_POOL_MAX_CONN)
 _init_db_done = False
 _init_db_lock = threading.Lock()
 
-# Instrumentation counters (thread-safe)
+# Instrumentation counters.
+# Hot-path counters (bumped on every query / cache lookup) live in a
+# thread-local dict, so incrementing them never takes a lock. A request is
+# served on a single thread, so these are naturally per-request.
+# Rare process-wide events (exhaustions, discards) stay under _stats_lock.
 _stats_lock = threading.Lock()
 _pool_stats = {
-    "borrows": 0,
-    "returns": 0,
     "exhaustions": 0,
     "discards": 0,
-    "queries_this_rerun": 0,
 }
+_thread_stats_local = threading.local()
+
+
+def _thread_stats() -> Dict[str, float]:
+    """Return the calling thread's hot-path counters (lock-free)."""
+    stats = getattr(_thread_stats_local, "stats", None)
+    if stats is None:
+        stats = _thread_stats_local.stats = {
+            "borrows": 0,
+            "returns": 0,
+            "queries_this_rerun": 0,
+            "total_db_time_ms": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+    return stats
 
 # =============================================================================
 # TTL CACHE (for reference data)
 # =============================================================================
-_cache: Dict[str, Any] = {}
-_cache_expiry: Dict[str, float] = {}
-_cache_lock = threading.Lock()
-_CACHE_MAX_SIZE = 100  # Prevent unbounded growth
+# Striped by key hash so lookups on unrelated keys never share a lock.
+# Each shard is in LRU order (least recently used first); values are
+# (result, expires_at).
+_CACHE_SHARDS = 8  # Power of two (index via bitmask)
+_CACHE_MAX_SIZE = 16  # Per shard - prevent unbounded growth
+_cache_shards: List["OrderedDict[Any, tuple]"] = [OrderedDict() for _ in range(_CACHE_SHARDS)]
+_cache_locks: List[threading.Lock] = [threading.Lock() for _ in range(_CACHE_SHARDS)]
+
 
+def _cache_shard(key):
+    """Return (shard, lock) responsible for a cache key."""
+    idx = hash(key) & (_CACHE_SHARDS - 1)
+    return _cache_shards[idx], _cache_locks[idx]
 
-def _make_cache_key(func_name: str, args: tuple, kwargs: dict) -> str:
+
+def _make_cache_key(func_name: str, args: tuple, kwargs: dict) -> Any:
     """Create a safe, hashable cache key from function call."""
-    # Convert args/kwargs to string representation (safe for unhashables)
+    # Fast path: plain tuple key, hashed natively
+    key = (func_name, args, tuple(sorted(kwargs.items())) if kwargs else ())
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        pass
+    # Unhashable args (e.g. department lists) - fall back to repr
     try:
         key_parts = [func_name, repr(args), repr(sorted(kwargs.items()))]
     except Exception:
@@ -68,21 +111,24 @@ def _make_cache_key(func_name: str, args: tuple, kwargs: dict) -> str:
 
 
 def _purge_expired_cache():
-    """Remove expired entries from cache. Called periodically."""
+    """Remove expired entries from cache. Admin helper, not on the hot path."""
     now = time.time()
-    expired_keys = [k for k, exp in _cache_expiry.items() if exp <= now]
-    for k in expired_keys:
-        _cache.pop(k, None)
-        _cache_expiry.pop(k, None)
-    if expired_keys:
-        _logger.debug(f"Purged {len(expired_keys)} expired cache entries")
+    purged = 0
+    for shard, lock in zip(_cache_shards, _cache_locks):
+        with lock:
+            expired_keys = [k for k, (_, exp) in shard.items() if exp <= now]
+            for k in expired_keys:
+                del shard[k]
+        purged += len(expired_keys)
+    if purged:
+        _logger.debug(f"Purged {purged} expired cache entries")
 
 
 def clear_cache():
     """Clear all cached data. Call after Sync or data-changing operations."""
-    with _cache_lock:
-        _cache.clear()
-        _cache_expiry.clear()
+    for shard, lock in zip(_cache_shards, _cache_locks):
+        with lock:
+            shard.clear()
     _logger.info("Reference data cache cleared")
 
 
@@ -90,47 +136,42 @@ def cached(ttl_seconds: int = 30):
     """
     TTL cache decorator for read-only DB functions.
     - Safe for unhashable args
-    - Clears expired entries on each call
-    - Bounded size
+    - Lock-free hits; only stores and evictions take the shard lock
+    - Expired entries are replaced lazily on the next miss
+    - Bounded size (LRU eviction, O(1) per call)
     - Tracks hits/misses
     """
-    import functools
-    
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             key = _make_cache_key(func.__name__, args, kwargs)
             now = time.time()
+            shard, lock = _cache_shard(key)
             
-            with _cache_lock:
-                # Purge expired entries occasionally
-                if len(_cache) > 10:
-                    _purge_expired_cache()
-                
-                # Check cache hit
-                if key in _cache and _cache_expiry.get(key, 0) > now:
-                    with _stats_lock:
-                        _pool_stats["cache_hits"] = _pool_stats.get("cache_hits", 0) + 1
-                    return _cache[key]
-                
-                # Prevent unbounded growth
-                if len(_cache) >= _CACHE_MAX_SIZE:
-                    _purge_expired_cache()
-                    if len(_cache) >= _CACHE_MAX_SIZE:
-                        # Force clear oldest entries
-                        oldest = sorted(_cache_expiry.items(), key=lambda x: x[1])[:10]
-                        for k, _ in oldest:
-                            _cache.pop(k, None)
-                            _cache_expiry.pop(k, None)
+            # Check cache hit without the lock (dict reads are atomic under the GIL)
+            entry = shard.get(key)
+            if entry is not None and entry[1] > now:
+                # Recency bump is best-effort: a hit never waits on a busy shard
+                if lock.acquire(blocking=False):
+                    try:
+                        if key in shard:
+                            shard.move_to_end(key)
+                    finally:
+                        lock.release()
+                _thread_stats()["cache_hits"] += 1
+                return entry[0]
             
-            # Cache miss - execute function (outside lock)
-            with _stats_lock:
-                _pool_stats["cache_misses"] = _pool_stats.get("cache_misses", 0) + 1
+            # Cache miss or expired - execute function (outside lock);
+            # the store below overwrites any expired entry
+            _thread_stats()["cache_misses"] += 1
             result = func(*args, **kwargs)
             
-            with _cache_lock:
-                _cache[key] = result
-                _cache_expiry[key] = now + ttl_seconds
+            with lock:
+                shard[key] = (result, now + ttl_seconds)
+                shard.move_to_end(key)
+                # Prevent unbounded growth - evict least recently used
+                while len(shard) > _CACHE_MAX_SIZE:
+                    shard.popitem(last=False)
             
             return result
         return wrapper
@@ -143,13 +184,15 @@ def _get_pool() -> ThreadedConnectionPool:
     Called on first DB access, not on import.
     """
     global _pool
-    if _pool is not None:
-        return _pool
+    pool = _pool  # Single global read on the fast path
+    if pool is not None:
+        return pool
     
     with _pool_lock:
         # Double-check inside lock
-        if _pool is not None:
-            return _pool
+        pool = _pool
+        if pool is not None:
+            return pool
         
         url = os.environ.get("DATABASE_URL")
         if not url:
@@ -157,14 +200,15 @@ def _get_pool() -> ThreadedConnectionPool:
         if url.startswith("postgres://"):
             url = url.replace("postgres://", "postgresql://", 1)
         
-        _pool = ThreadedConnectionPool(
+        pool = ThreadedConnectionPool(
             minconn=2,
-            maxconn=10,
+            maxconn=_POOL_MAX_CONN,
             dsn=url,
             cursor_factory=RealDictCursor
         )
-        _logger.info("Connection pool initialized (min=2, max=10)")
-        return _pool
+        _pool = pool
+        _logger.info("Connection pool initialized (min=2, max=%d)", _POOL_MAX_CONN)
+        return pool
 
 
 def get_connection():
@@ -174,27 +218,20 @@ def get_connection():
     """
     pool = _get_pool()
     
-    # Explicit 2s wait with retries (pool.getconn can block or raise)
-    start = time.time()
-    max_wait = 2.0
-    attempt = 0
+    # Holding a permit guarantees pool.getconn() has a free slot
+    if not _pool_slots.acquire(timeout=_POOL_ACQUIRE_TIMEOUT):
+        with _stats_lock:
+            _pool_stats["exhaustions"] += 1
+        _logger.warning("Pool exhaustion after %.2fs", _POOL_ACQUIRE_TIMEOUT)
+        raise RuntimeError("DB pool exhausted. Please retry.")
     
-    while True:
-        try:
-            conn = pool.getconn()
-            with _stats_lock:
-                _pool_stats["borrows"] += 1
-            return conn
-        except psycopg2.pool.PoolError:
-            elapsed = time.time() - start
-            if elapsed >= max_wait:
-                with _stats_lock:
-                    _pool_stats["exhaustions"] += 1
-                _logger.warning(f"Pool exhaustion after {elapsed:.2f}s")
-                raise RuntimeError("DB pool exhausted. Please retry.")
-            # Brief sleep before retry
-            time.sleep(0.1)
-            attempt += 1
+    try:
+        conn = pool.getconn()
+    except Exception:
+        _pool_slots.release()
+        raise
+    _thread_stats()["borrows"] += 1
+    return conn
 
 
 def return_connection(conn, healthy: bool = True):
@@ -206,8 +243,7 @@ def return_connection(conn, healthy: bool = True):
     try:
         if healthy:
             pool.putconn(conn)
-            with _stats_lock:
-                _pool_stats["returns"] += 1
+            _thread_stats()["returns"] += 1
         else:
             # Discard poisoned connection
             pool.putconn(conn, close=True)
@@ -216,38 +252,43 @@ def return_connection(conn, healthy: bool = True):
             _logger.info("Discarded unhealthy connection")
     except Exception as e:
         _logger.warning(f"Error returning connection: {e}")
+    finally:
+        # Closed or not, the slot is free again
+        _pool_slots.release()
 
 
 def get_pool_stats() -> Dict[str, int]:
-    """Return current pool instrumentation stats."""
+    """
+    Return pool instrumentation stats.
+    Hot-path counters are the calling thread's; exhaustions/discards are process-wide.
+    """
+    stats = dict(_thread_stats())
     with _stats_lock:
-        return dict(_pool_stats)
+        stats.update(_pool_stats)
+    return stats
 
 
 def reset_query_counter():
     """Reset the per-request counters. Call at start of each request."""
-    with _stats_lock:
-        _pool_stats["queries_this_rerun"] = 0
-        _pool_stats["total_db_time_ms"] = 0
-        _pool_stats["cache_hits"] = 0
-        _pool_stats["cache_misses"] = 0
-        _pool_stats["borrows"] = 0
+    stats = _thread_stats()
+    stats["queries_this_rerun"] = 0
+    stats["total_db_time_ms"] = 0
+    stats["cache_hits"] = 0
+    stats["cache_misses"] = 0
+    stats["borrows"] = 0
 
 
 def log_rerun_stats(total_ms: float = 0):
     """Log stats for this rerun. Call at end of page render."""
-    with _stats_lock:
-        db_time = _pool_stats.get('total_db_time_ms', 0)
-        cache_hits = _pool_stats.get('cache_hits', 0)
-        cache_misses = _pool_stats.get('cache_misses', 0)
-        _logger.info(
-            f"RERUN STATS: total={total_ms:.0f}ms, queries={_pool_stats['queries_this_rerun']}, "
-            f"db_time={db_time:.0f}ms, cache_hits={cache_hits}, cache_misses={cache_misses}, "
-            f"pool_borrows={_pool_stats['borrows']}"
-        )
-
+    stats = _thread_stats()
+    # Single deferred-format log line
+    _logger.info(
+        "RERUN STATS: total=%.0fms, queries=%d, db_time=%.0fms, "
+        "cache_hits=%d, cache_misses=%d, pool_borrows=%d",
+        total_ms, stats["queries_this_rerun"], stats["total_db_time_ms"],
+        stats["cache_hits"], stats["cache_misses"], stats["borrows"],
+    )
 
-from contextlib import contextmanager
 
 @contextmanager
 def transaction():
@@ -269,6 +310,26 @@ def transaction():
         return_connection(conn, healthy=healthy)
 
 
+# One left-to-right scan: quoted strings/identifiers and comments are matched
+# (and kept verbatim) before a bare '?' can be. Unterminated quotes/comments
+# run to end of input, same as the previous char-by-char state machine.
+_ADAPT_QUERY_RE = re.compile(
+    r"'(?:[^']|'')*(?:'|\Z)"       # single-quoted string ('' escapes)
+    r'|"(?:[^"]|"")*(?:"|\Z)'      # double-quoted identifier ("" escapes)
+    r"|--[^\n]*"                   # line comment
+    r"|/\*.*?(?:\*/|\Z)"           # block comment
+    r"|(\?)",                      # placeholder (group 1)
+    re.DOTALL,
+)
+
+
+def _adapt_query_sub(m) -> str:
+    return "%s" if m.group(1) else m.group(0)
+
+
+# adapt_query / is_write are pure functions of the SQL text, and execute() is
+# called with the same handful of query templates over and over.
+@functools.lru_cache(maxsize=256)
 def adapt_query(sql: str) -> str:
     """
     Convert SQLite-style '?' placeholders to psycopg2 '%s' placeholders,
@@ -278,112 +339,34 @@ def adapt_query(sql: str) -> str:
       - line comments: -- ...
       - block comments: /* ... */
     """
-    if not sql:
-        return sql
-
-    out = []
-    i = 0
-    n = len(sql)
-
-    in_single = False
-    in_double = False
-    in_line_comment = False
-    in_block_comment = False
-
-    while i < n:
-        ch = sql[i]
-
-        # End line comment
-        if in_line_comment:
-            out.append(ch)
-            if ch == "\n":
-                in_line_comment = False
-            i += 1
-            continue
-
-        # End block comment
-        if in_block_comment:
-            out.append(ch)
-            if ch == "*" and i + 1 < n and sql[i + 1] == "/":
-                out.append("/")
-                i += 2
-                in_block_comment = False
-            else:
-                i += 1
-            continue
+    if not sql or "?" not in sql:
+        return sql  # Nothing to convert - skip the scan
+    return _ADAPT_QUERY_RE.sub(_adapt_query_sub, sql)
 
-        # Start comments (only if not in quotes)
-        if not in_single and not in_double:
-            if ch == "-" and i + 1 < n and sql[i + 1] == "-":
-                out.append(ch)
-                out.append("-")
-                i += 2
-                in_line_comment = True
-                continue
-            if ch == "/" and i + 1 < n and sql[i + 1] == "*":
-                out.append(ch)
-                out.append("*")
-                i += 2
-                in_block_comment = True
-                continue
-
-        # Handle quotes
-        if ch == "'" and not in_double:
-            out.append(ch)
-            if in_single:
-                if i + 1 < n and sql[i + 1] == "'":
-                    out.append("'")
-                    i += 2
-                    continue
-                in_single = False
-            else:
-                in_single = True
-            i += 1
-            continue
-
-        if ch == '"' and not in_single:
-            out.append(ch)
-            if in_double:
-                if i + 1 < n and sql[i + 1] == '"':
-                    out.append('"')
-                    i += 2
-                    continue
-                in_double = False
-            else:
-                in_double = True
-            i += 1
-            continue
 
-        # Replace placeholder only when not in quotes/comments
-        if ch == "?" and not in_single and not in_double:
-            out.append("%s")
-            i += 1
-            continue
-
-        out.append(ch)
-        i += 1
-
-    return "".join(out)
+_WRITE_TOKENS = frozenset({
+    "INSERT", "UPDATE", "DELETE", "CREATE",
+    "ALTER", "DROP", "TRUNCATE", "MERGE"
+})
+_WRITE_KEYWORD_RE = re.compile(
+    r"\b(?:INSERT|UPDATE|DELETE|MERGE|CREATE|ALTER|DROP|TRUNCATE)\b", re.IGNORECASE
+)
 
 
+@functools.lru_cache(maxsize=256)
 def is_write(sql: str) -> bool:
     """Check if SQL is a write operation. Handles CTE (WITH) queries."""
-    if not sql or not sql.strip():
+    if not sql:
         return False
     s = sql.lstrip()
+    if not s:
+        return False
     token = s.split(None, 1)[0].upper()
 
     if token == "WITH":
-        # CTE query - check for write keywords in body
-        upper = s.upper()
-        return any(k in upper for k in (
-            " INSERT ", " UPDATE ", " DELETE ", " MERGE ",
-            " CREATE ", " ALTER ", " DROP ", " TRUNCATE "
-        ))
-    return token in {
-        "INSERT", "UPDATE", "DELETE", "CREATE",
-        "ALTER", "DROP", "TRUNCATE", "MERGE"
-    }
+        # CTE query - one case-insensitive scan for write keywords in body
+        return _WRITE_KEYWORD_RE.search(s) is not None
+    return token in _WRITE_TOKENS
 
 
 def execute(sql: str, params=None, *, fetch="none", conn=None):
@@ -398,7 +381,7 @@ def execute(sql: str, params=None, *, fetch="none", conn=None):
     - No autocommit (caller commits via transaction context manager)
     - No pool return (caller returns via transaction context manager)
     """
-    query_start = time.time()
+    query_start = time.perf_counter_ns()
     owns_conn = conn is None
     if owns_conn:
         conn = get_connection()
@@ -419,15 +402,15 @@ def execute(sql: str, params=None, *, fetch="none", conn=None):
                 conn.commit()
             
             # Timing and counters
-            elapsed_ms = (time.time() - query_start) * 1000
-            with _stats_lock:
-                _pool_stats["queries_this_rerun"] += 1
-                _pool_stats["total_db_time_ms"] = _pool_stats.get("total_db_time_ms", 0) + elapsed_ms
+            elapsed_ms = (time.perf_counter_ns() - query_start) / 1_000_000
+            stats = _thread_stats()
+            stats["queries_this_rerun"] += 1
+            stats["total_db_time_ms"] += elapsed_ms
             
             # Log slow queries (>100ms)
             if elapsed_ms > 100:
                 query_preview = sql.strip()[:80].replace('\n', ' ')
-                _logger.warning(f"SLOW QUERY ({elapsed_ms:.0f}ms, {row_count} rows): {query_preview}...")
+                _logger.warning("SLOW QUERY (%.0fms, %d rows): %s...", elapsed_ms, row_count, query_preview)
             
             return result
     except psycopg2.OperationalError as e:
@@ -460,6 +443,259 @@ def make_resource_key(
     return hashlib.sha256(raw.encode()).hexdigest()[:32]
 
 
+# Whole schema + idempotent migrations, sent to the server as one
+# multi-statement batch (one round trip, one transaction).
+_INIT_DB_SQL = """
+-- Resources table
+CREATE TABLE IF NOT EXISTS resources (
+    resource_key TEXT PRIMARY KEY,
+    drive_item_id TEXT,
+
+    relative_path TEXT NOT NULL,
+    bucket TEXT,
+    primary_department TEXT,
+    sub_department TEXT,
+    training_type TEXT,
+
+    resource_type TEXT NOT NULL,
+    display_name TEXT,
+    web_url TEXT,
+
+    resource_count INTEGER DEFAULT 1,
+    valid_link_count INTEGER DEFAULT 0,
+    contents_count INTEGER DEFAULT 0,
+    is_placeholder INTEGER DEFAULT 0,
+
+    scrub_status TEXT DEFAULT 'not_reviewed',
+    scrub_notes TEXT,
+    scrub_owner TEXT,
+    scrub_updated TEXT,
+
+    invest_decision TEXT,
+    invest_owner TEXT,
+    invest_effort TEXT,
+    invest_notes TEXT,
+    invest_updated TEXT,
+
+    first_seen TEXT,
+    last_seen TEXT,
+    source TEXT,
+    is_archived INTEGER DEFAULT 0,
+    audience TEXT,
+    approved_for_investment INTEGER DEFAULT 0,
+    scrub_reasons TEXT,
+    sales_stage TEXT
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_resources_path ON resources(relative_path);
+CREATE INDEX IF NOT EXISTS idx_resources_bucket ON resources(bucket);
+CREATE INDEX IF NOT EXISTS idx_resources_dept ON resources(primary_department);
+CREATE INDEX IF NOT EXISTS idx_resources_subdept ON resources(sub_department);
+CREATE INDEX IF NOT EXISTS idx_resources_scrub_status ON resources(scrub_status);
+CREATE INDEX IF NOT EXISTS idx_resources_active ON resources(is_archived, is_placeholder);
+CREATE INDEX IF NOT EXISTS idx_resources_approved ON resources(approved_for_investment);
+CREATE INDEX IF NOT EXISTS idx_resources_drive_item_id ON resources(drive_item_id);
+
+-- Partial covering indexes for the canonical active predicate, so the
+-- dashboard/inventory aggregates can use index-only scans (PostgreSQL 11+)
+CREATE INDEX IF NOT EXISTS idx_resources_active_dept ON resources(primary_department)
+    INCLUDE (resource_count, bucket, training_type, sales_stage, scrub_status, audience)
+    WHERE is_archived = 0 AND is_placeholder = 0;
+CREATE INDEX IF NOT EXISTS idx_resources_active_sales_stage ON resources(sales_stage)
+    INCLUDE (resource_count)
+    WHERE is_archived = 0 AND is_placeholder = 0 AND sales_stage IS NOT NULL;
+
+-- Legacy catalog_items table (for backwards compatibility)
+CREATE TABLE IF NOT EXISTS catalog_items (
+    item_id TEXT PRIMARY KEY,
+    department TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    functional_area TEXT NOT NULL,
+    training_type TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    item_identity TEXT NOT NULL UNIQUE,
+    display_name TEXT,
+    size INTEGER,
+    modified TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_type TEXT DEFAULT 'sharepoint',
+    scrub_status TEXT DEFAULT 'not_reviewed',
+    scrub_notes TEXT,
+    scrub_owner TEXT,
+    scrub_updated TEXT,
+    invest_decision TEXT,
+    invest_owner TEXT,
+    invest_effort TEXT,
+    invest_notes TEXT,
+    invest_updated TEXT
+);
+
+-- Scan snapshots table
+CREATE TABLE IF NOT EXISTS scan_snapshots (
+    snapshot_id SERIAL PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    total_items INTEGER NOT NULL,
+    total_files INTEGER NOT NULL,
+    total_links INTEGER NOT NULL,
+    areas_with_training INTEGER NOT NULL,
+    areas_without_training INTEGER NOT NULL,
+    coverage_pct REAL NOT NULL,
+    source TEXT NOT NULL
+);
+
+-- Sync runs table for CFO metrics
+CREATE TABLE IF NOT EXISTS sync_runs (
+    run_id SERIAL PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    source TEXT NOT NULL,
+    active_total_before INTEGER NOT NULL,
+    added_count INTEGER NOT NULL,
+    archived_count INTEGER NOT NULL,
+    active_total_after INTEGER NOT NULL
+);
+
+-- Sync settings table (delta token storage)
+CREATE TABLE IF NOT EXISTS sync_settings (
+    setting_key TEXT PRIMARY KEY,
+    setting_value TEXT,
+    updated_at TEXT
+);
+
+-- Departments table
+CREATE TABLE IF NOT EXISTS departments (
+    department TEXT PRIMARY KEY,
+    last_seen TEXT NOT NULL
+);
+
+-- Applied one-time data migrations (see _DATA_MIGRATION_VERSION)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Migration: version columns for optimistic locking
+ALTER TABLE resources ADD COLUMN IF NOT EXISTS scrub_version INTEGER DEFAULT 1;
+ALTER TABLE resources ADD COLUMN IF NOT EXISTS invest_version INTEGER DEFAULT 1;
+
+-- Migration: last_reviewed_by for audit trail
+ALTER TABLE resources ADD COLUMN IF NOT EXISTS last_reviewed_by TEXT DEFAULT NULL;
+
+-- Migration: invest_cost, invest_modified_at, invest_modified_by
+ALTER TABLE resources ADD COLUMN IF NOT EXISTS invest_cost VARCHAR(20) DEFAULT NULL;
+ALTER TABLE resources ADD COLUMN IF NOT EXISTS invest_modified_at TIMESTAMP DEFAULT NULL;
+ALTER TABLE resources ADD COLUMN IF NOT EXISTS invest_modified_by VARCHAR(50) DEFAULT NULL;
+
+-- User profiles table (for force_password_change flag)
+CREATE TABLE IF NOT EXISTS user_profiles (
+    user_id INTEGER PRIMARY KEY,
+    force_password_change BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Chat tables (for AI Chatbot)
+CREATE TABLE IF NOT EXISTS chat_conversations (
+    conversation_id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    title TEXT DEFAULT 'New conversation',
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_chat_conv_user ON chat_conversations(user_id);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    message_id SERIAL PRIMARY KEY,
+    conversation_id INTEGER REFERENCES chat_conversations(conversation_id) ON DELETE CASCADE,
+    role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+    content TEXT NOT NULL,
+    metadata JSONB,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_chat_msg_conv ON chat_messages(conversation_id);
+
+-- Undo buffer (per-user, single action)
+CREATE TABLE IF NOT EXISTS chat_undo_buffer (
+    user_id INTEGER PRIMARY KEY,
+    action_type TEXT,
+    affected_keys TEXT[],
+    previous_state JSONB,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Pending actions (awaiting confirmation)
+CREATE TABLE IF NOT EXISTS chat_pending_actions (
+    user_id INTEGER PRIMARY KEY,
+    action_data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- query_context column for follow-up support
+ALTER TABLE chat_conversations ADD COLUMN IF NOT EXISTS query_context JSONB;
+
+-- AI usage tracking for cost monitoring
+CREATE TABLE IF NOT EXISTS ai_usage_log (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER,
+    username TEXT,
+    conversation_id INTEGER,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    model TEXT NOT NULL DEFAULT 'gpt-5.2',
+    estimated_cost_usd NUMERIC(10, 6) DEFAULT 0,
+    call_type TEXT DEFAULT 'chat',
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_ai_usage_created ON ai_usage_log(created_at);
+
+-- SME directory tables
+CREATE TABLE IF NOT EXISTS sme_contacts (
+    sme_id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    role TEXT DEFAULT NULL,
+    email TEXT DEFAULT NULL,
+    notes TEXT DEFAULT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS sme_departments (
+    id SERIAL PRIMARY KEY,
+    sme_id INTEGER REFERENCES sme_contacts(sme_id) ON DELETE CASCADE,
+    department TEXT NOT NULL,
+    sub_department TEXT NOT NULL DEFAULT 'All'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sme_dept_unique ON sme_departments(sme_id, department, sub_department);
+CREATE INDEX IF NOT EXISTS idx_sme_dept_lookup ON sme_departments(department);
+"""
+
+# One-time data fixes. These rewrite rows, so they run only until the
+# matching version is recorded in schema_migrations; later boots skip the
+# table scans entirely. Bump the version when adding a new data migration.
+_DATA_MIGRATION_VERSION = 1
+_DATA_MIGRATIONS_SQL = """
+-- Migration: backfill first_seen for rows where it's NULL
+UPDATE resources
+SET first_seen = COALESCE(first_seen, last_seen, NOW()::TEXT)
+WHERE first_seen IS NULL OR first_seen = '';
+
+-- Normalize legacy statuses to canonical, and force NULL/empty/unknown
+-- values to not_reviewed, in a single pass over non-canonical rows
+UPDATE resources SET scrub_status = CASE
+    WHEN scrub_status IN ('PASS', 'keep') THEN 'Include'
+    WHEN scrub_status IN ('HOLD', 'modify', 'gap') THEN 'Modify'
+    WHEN scrub_status = 'BLOCK' OR LOWER(scrub_status) = 'sunset' THEN 'Sunset'
+    ELSE 'not_reviewed'
+END
+WHERE scrub_status IS NULL
+   OR scrub_status NOT IN ('not_reviewed', 'Include', 'Modify', 'Sunset');
+"""
+
+
 def init_db() -> None:
     """
     Initialize database schema (PostgreSQL).
@@ -484,364 +720,19 @@ def init_db() -> None:
         conn = get_connection()
         try:
             with conn.cursor() as cursor:
-                # Resources table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS resources (
-                        resource_key TEXT PRIMARY KEY,
-                        drive_item_id TEXT,
-                        
-                        relative_path TEXT NOT NULL,
-                        bucket TEXT,
-                        primary_department TEXT,
-                        sub_department TEXT,
-                        training_type TEXT,
-                        
-                        resource_type TEXT NOT NULL,
-                        display_name TEXT,
-                        web_url TEXT,
-                        
-                        resource_count INTEGER DEFAULT 1,
-                        valid_link_count INTEGER DEFAULT 0,
-                        contents_count INTEGER DEFAULT 0,
-                        is_placeholder INTEGER DEFAULT 0,
-                        
-                        scrub_status TEXT DEFAULT 'not_reviewed',
-                        scrub_notes TEXT,
-                        scrub_owner TEXT,
-                        scrub_updated TEXT,
-                        
-                        invest_decision TEXT,
-                        invest_owner TEXT,
-                        invest_effort TEXT,
-                        invest_notes TEXT,
-                        invest_updated TEXT,
-                        
-                        first_seen TEXT,
-                        last_seen TEXT,
-                        source TEXT,
-                        is_archived INTEGER DEFAULT 0,
-                        audience TEXT,
-                        approved_for_investment INTEGER DEFAULT 0,
-                        scrub_reasons TEXT,
-                        sales_stage TEXT
-                    )
-                """)
-                
-                # Indexes
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_path 
-                    ON resources(relative_path)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_bucket 
-                    ON resources(bucket)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_dept 
-                    ON resources(primary_department)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_subdept 
-                    ON resources(sub_department)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_scrub_status 
-                    ON resources(scrub_status)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_active 
-                    ON resources(is_archived, is_placeholder)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_approved 
-                    ON resources(approved_for_investment)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_resources_drive_item_id
-                    ON resources(drive_item_id)
-                """)
-                
-                # Legacy catalog_items table (for backwards compatibility)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS catalog_items (
-                        item_id TEXT PRIMARY KEY,
-                        department TEXT NOT NULL,
-                        bucket TEXT NOT NULL,
-                        functional_area TEXT NOT NULL,
-                        training_type TEXT NOT NULL,
-                        item_type TEXT NOT NULL,
-                        item_identity TEXT NOT NULL UNIQUE,
-                        display_name TEXT,
-                        size INTEGER,
-                        modified TEXT,
-                        first_seen TEXT NOT NULL,
-                        last_seen TEXT NOT NULL,
-                        source TEXT NOT NULL,
-                        source_type TEXT DEFAULT 'sharepoint',
-                        scrub_status TEXT DEFAULT 'not_reviewed',
-                        scrub_notes TEXT,
-                        scrub_owner TEXT,
-                        scrub_updated TEXT,
-                        invest_decision TEXT,
-                        invest_owner TEXT,
-                        invest_effort TEXT,
-                        invest_notes TEXT,
-                        invest_updated TEXT
-                    )
-                """)
-                
-                # Scan snapshots table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS scan_snapshots (
-                        snapshot_id SERIAL PRIMARY KEY,
-                        timestamp TEXT NOT NULL,
-                        total_items INTEGER NOT NULL,
-                        total_files INTEGER NOT NULL,
-                        total_links INTEGER NOT NULL,
-                        areas_with_training INTEGER NOT NULL,
-                        areas_without_training INTEGER NOT NULL,
-                        coverage_pct REAL NOT NULL,
-                        source TEXT NOT NULL
-                    )
-                """)
-                
-                # Sync runs table for CFO metrics
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS sync_runs (
-                        run_id SERIAL PRIMARY KEY,
-                        started_at TEXT NOT NULL,
-                        finished_at TEXT,
-                        source TEXT NOT NULL,
-                        active_total_before INTEGER NOT NULL,
-                        added_count INTEGER NOT NULL,
-                        archived_count INTEGER NOT NULL,
-                        active_total_after INTEGER NOT NULL
-                    )
-                """)
-                
-                # Sync settings table (delta token storage)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS sync_settings (
-                        setting_key TEXT PRIMARY KEY,
-                        setting_value TEXT,
-                        updated_at TEXT
-                    )
-                """)
-                
-                # Departments table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS departments (
-                        department TEXT PRIMARY KEY,
-                        last_seen TEXT NOT NULL
-                    )
-                """)
-                
-                # Migration: backfill first_seen for rows where it's NULL
-                cursor.execute("""
-                    UPDATE resources
-                    SET first_seen = COALESCE(first_seen, last_seen, NOW()::TEXT)
-                    WHERE first_seen IS NULL OR first_seen = ''
-                """)
-                
-                # Normalize legacy statuses to canonical
-                cursor.execute("UPDATE resources SET scrub_status = 'Include' WHERE scrub_status = 'PASS'")
-                cursor.execute("UPDATE resources SET scrub_status = 'Include' WHERE scrub_status = 'keep'")
-                cursor.execute("UPDATE resources SET scrub_status = 'Modify' WHERE scrub_status = 'HOLD'")
-                cursor.execute("UPDATE resources SET scrub_status = 'Modify' WHERE scrub_status = 'modify'")
-                cursor.execute("UPDATE resources SET scrub_status = 'Modify' WHERE scrub_status = 'gap'")
-                cursor.execute("UPDATE resources SET scrub_status = 'Sunset' WHERE scrub_status = 'BLOCK'")
-                cursor.execute("UPDATE resources SET scrub_status = 'Sunset' WHERE LOWER(scrub_status) = 'sunset'")
-                
-                # Force NULL/empty to not_reviewed
-                cursor.execute("""
-                    UPDATE resources SET scrub_status = 'not_reviewed' 
-                    WHERE scrub_status IS NULL OR scrub_status = ''
-                """)
-                
-                # Force any remaining unknown value to not_reviewed
-                cursor.execute("""
-                    UPDATE resources SET scrub_status = 'not_reviewed' 
-                    WHERE scrub_status NOT IN ('not_reviewed', 'Include', 'Modify', 'Sunset')
-                """)
-                
-                # Migration: Add version columns for optimistic locking
-                # Note: PostgreSQL aborts transaction on ALTER TABLE failure, need rollback
-                for col_name in ['scrub_version', 'invest_version']:
-                    try:
-                        cursor.execute(f"""
-                            ALTER TABLE resources 
-                            ADD COLUMN {col_name} INTEGER DEFAULT 1
-                        """)
-                        conn.commit()  # Commit each successful ALTER
-                        _logger.info(f"Migration: Added {col_name} column")
-                    except Exception as e:
-                        conn.rollback()  # PostgreSQL requires rollback after failed statement
-                        if 'already exists' in str(e).lower() or 'duplicate' in str(e).lower():
-                            _logger.debug(f"Column {col_name} already exists, skipping")
-                        else:
-                            raise
-                
-                # Migration: Add last_reviewed_by for audit trail
-                try:
-                    cursor.execute("""
-                        ALTER TABLE resources 
-                        ADD COLUMN last_reviewed_by TEXT DEFAULT NULL
-                    """)
-                    conn.commit()
-                    _logger.info("Migration: Added last_reviewed_by column")
-                except Exception as e:
-                    conn.rollback()  # PostgreSQL requires rollback after failed statement
-                    if 'already exists' in str(e).lower() or 'duplicate' in str(e).lower():
-                        _logger.debug("Column last_reviewed_by already exists, skipping")
-                    else:
-                        raise
-                
-                # Migration: Add invest_cost, invest_modified_at, invest_modified_by columns
-                for col_def in [
-                    ('invest_cost', 'VARCHAR(20) DEFAULT NULL'),
-                    ('invest_modified_at', 'TIMESTAMP DEFAULT NULL'),
-                    ('invest_modified_by', 'VARCHAR(50) DEFAULT NULL'),
-                ]:
-                    col_name, col_type = col_def
-                    try:
-                        cursor.execute(f"""
-                            ALTER TABLE resources 
-                            ADD COLUMN {col_name} {col_type}
-                        """)
-                        conn.commit()
-                        _logger.info(f"Migration: Added {col_name} column")
-                    except Exception as e:
-                        conn.rollback()
-                        if 'already exists' in str(e).lower() or 'duplicate' in str(e).lower():
-                            _logger.debug(f"Column {col_name} already exists, skipping")
-                        else:
-                            raise
-                
-                # User profiles table (for force_password_change flag)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS user_profiles (
-                        user_id INTEGER PRIMARY KEY,
-                        force_password_change BOOLEAN DEFAULT TRUE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # =========================================================
-                # Chat Tables (for AI Chatbot)
-                # =========================================================
-                
-                # Chat conversations
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS chat_conversations (
-                        conversation_id SERIAL PRIMARY KEY,
-                        user_id INTEGER NOT NULL,
-                        title TEXT DEFAULT 'New conversation',
-                        created_at TIMESTAMP DEFAULT NOW(),
-                        updated_at TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_chat_conv_user 
-                    ON chat_conversations(user_id)
-                """)
-                
-                # Chat messages
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS chat_messages (
-                        message_id SERIAL PRIMARY KEY,
-                        conversation_id INTEGER REFERENCES chat_conversations(conversation_id) ON DELETE CASCADE,
-                        role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
-                        content TEXT NOT NULL,
-                        metadata JSONB,
-                        created_at TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_chat_msg_conv 
-                    ON chat_messages(conversation_id)
-                """)
-                
-                # Undo buffer (per-user, single action)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS chat_undo_buffer (
-                        user_id INTEGER PRIMARY KEY,
-                        action_type TEXT,
-                        affected_keys TEXT[],
-                        previous_state JSONB,
-                        created_at TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                
-                # Pending actions (awaiting confirmation)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS chat_pending_actions (
-                        user_id INTEGER PRIMARY KEY,
-                        action_data JSONB NOT NULL,
-                        created_at TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                
-                # Add query_context column for follow-up support
-                cursor.execute("""
-                    ALTER TABLE chat_conversations 
-                    ADD COLUMN IF NOT EXISTS query_context JSONB
-                """)
-                
-                # AI Usage tracking for cost monitoring
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS ai_usage_log (
-                        id SERIAL PRIMARY KEY,
-                        user_id INTEGER,
-                        username TEXT,
-                        conversation_id INTEGER,
-                        prompt_tokens INTEGER NOT NULL DEFAULT 0,
-                        completion_tokens INTEGER NOT NULL DEFAULT 0,
-                        total_tokens INTEGER NOT NULL DEFAULT 0,
-                        model TEXT NOT NULL DEFAULT 'gpt-5.2',
-                        estimated_cost_usd NUMERIC(10, 6) DEFAULT 0,
-                        call_type TEXT DEFAULT 'chat',
-                        created_at TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_ai_usage_created 
-                    ON ai_usage_log(created_at)
-                """)
-                
-                # =========================================================
-                # SME Directory Tables
-                # =========================================================
-                
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS sme_contacts (
-                        sme_id SERIAL PRIMARY KEY,
-                        name TEXT NOT NULL,
-                        role TEXT DEFAULT NULL,
-                        email TEXT DEFAULT NULL,
-                        notes TEXT DEFAULT NULL,
-                        is_active BOOLEAN DEFAULT TRUE,
-                        created_at TIMESTAMP DEFAULT NOW(),
-                        updated_at TIMESTAMP DEFAULT NOW()
-                    )
-                """)
+                cursor.execute(_INIT_DB_SQL)
                 
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS sme_departments (
-                        id SERIAL PRIMARY KEY,
-                        sme_id INTEGER REFERENCES sme_contacts(sme_id) ON DELETE CASCADE,
-                        department TEXT NOT NULL,
-                        sub_department TEXT NOT NULL DEFAULT 'All'
+                cursor.execute(
+                    "SELECT 1 FROM schema_migrations WHERE version >= %s",
+                    (_DATA_MIGRATION_VERSION,)
+                )
+                if cursor.fetchone() is None:
+                    cursor.execute(_DATA_MIGRATIONS_SQL)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version) VALUES (%s) ON CONFLICT DO NOTHING",
+                        (_DATA_MIGRATION_VERSION,)
                     )
-                """)
-                cursor.execute("""
-                    CREATE UNIQUE INDEX IF NOT EXISTS idx_sme_dept_unique
-                    ON sme_departments(sme_id, department, sub_department)
-                """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_sme_dept_lookup
-                    ON sme_departments(department)
-                """)
-                
+                    _logger.info("Migration: applied data migrations v%d", _DATA_MIGRATION_VERSION)
             conn.commit()
             _logger.info("init_db() completed successfully")
         finally:
@@ -880,62 +771,21 @@ def upsert_resource(
     """
     now = last_seen_override or datetime.now(timezone.utc).isoformat()
     
-    existing = execute(
-        "SELECT resource_key FROM resources WHERE resource_key = ?",
-        (resource_key,),
-        fetch="one"
-    )
-    
-    if existing:
-        # Update metadata only (preserve user decisions)
-        # Always set is_archived = 0 (resource is current)
-        execute("""
-            UPDATE resources SET
-                relative_path = ?,
-                bucket = ?,
-                primary_department = ?,
-                sub_department = ?,
-                training_type = ?,
-                display_name = ?,
-                web_url = ?,
-                resource_count = ?,
-                valid_link_count = ?,
-                contents_count = ?,
-                is_placeholder = ?,
-                last_seen = ?,
-                source = ?,
-                drive_item_id = ?,
-                is_archived = 0
-            WHERE resource_key = ?
-        """, (
-            relative_path, bucket, primary_department, sub_department, training_type,
-            display_name, web_url, resource_count, valid_link_count, contents_count,
-            int(is_placeholder), now, source, drive_item_id, resource_key
-        ))
-        return False
-    else:
-        execute("""
-            INSERT INTO resources (
-                resource_key, drive_item_id, relative_path, bucket,
-                primary_department, sub_department, training_type, resource_type,
-                display_name, web_url, resource_count, valid_link_count,
-                contents_count, is_placeholder, first_seen, last_seen, source, is_archived
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
-        """, (
-            resource_key, drive_item_id, relative_path, bucket,
-            primary_department, sub_department, training_type, resource_type,
-            display_name, web_url, resource_count, valid_link_count,
-            contents_count, int(is_placeholder), now, now, source
-        ))
-        return True
+    # Single round trip, same statement as the batched upsert (params in
+    # _UPSERT_COLUMNS order). xmax = 0 only for a freshly inserted row version.
+    row = execute(_UPSERT_ONE_SQL, (
+        resource_key, drive_item_id, relative_path, bucket,
+        primary_department, sub_department, training_type, resource_type,
+        display_name, web_url, resource_count, valid_link_count,
+        contents_count, int(is_placeholder), now, now, source, 0
+    ), fetch="one")
+    return bool(row and row["inserted"])
 
 
 # =============================================================================
 # Batched Upsert (Performance Optimization)
 # =============================================================================
 
-from psycopg2.extras import execute_values
-
 # Column order for batch upsert (must match tuple order)
 _UPSERT_COLUMNS = (
     "resource_key", "drive_item_id", "relative_path", "bucket",
@@ -947,9 +797,9 @@ _UPSERT_COLUMNS = (
 # Required keys that must NOT be None (based on schema NOT NULL constraints)
 _REQUIRED_KEYS = frozenset({"resource_key", "relative_path", "resource_type"})
 
-_UPSERT_SQL = f"""
-INSERT INTO resources ({', '.join(_UPSERT_COLUMNS)})
-VALUES %s
+# On conflict, update metadata only (preserve user decisions) and always
+# set is_archived = 0 (resource is current). Shared by both upsert paths.
+_UPSERT_CONFLICT_SQL = """
 ON CONFLICT (resource_key) DO UPDATE SET
     relative_path = EXCLUDED.relative_path,
     bucket = EXCLUDED.bucket,
@@ -968,6 +818,16 @@ ON CONFLICT (resource_key) DO UPDATE SET
     is_archived = 0
 """
 
+_UPSERT_SQL = f"""
+INSERT INTO resources ({', '.join(_UPSERT_COLUMNS)})
+VALUES %s{_UPSERT_CONFLICT_SQL}"""
+
+# Single-row form for upsert_resource(); RETURNING reports insert vs update
+_UPSERT_ONE_SQL = f"""
+INSERT INTO resources ({', '.join(_UPSERT_COLUMNS)})
+VALUES ({', '.join('?' * len(_UPSERT_COLUMNS))}){_UPSERT_CONFLICT_SQL}RETURNING (xmax = 0) AS inserted
+"""
+
 
 def batch_upsert_resources(rows: list, *, conn, chunk_size: int = 500) -> int:
     """
@@ -1002,15 +862,15 @@ def batch_upsert_resources(rows: list, *, conn, chunk_size: int = 500) -> int:
         t = tuple(row.get(col) for col in _UPSERT_COLUMNS)
         tuples.append(t)
     
-    query_start = time.time()
+    query_start = time.perf_counter_ns()
     
     with conn.cursor() as cursor:
         for i in range(0, len(tuples), chunk_size):
             chunk = tuples[i:i + chunk_size]
             execute_values(cursor, _UPSERT_SQL, chunk)
     
-    elapsed_ms = (time.time() - query_start) * 1000
-    _logger.info(f"BATCH UPSERT: {len(rows)} rows in {elapsed_ms:.0f}ms")
+    elapsed_ms = (time.perf_counter_ns() - query_start) / 1_000_000
+    _logger.info("BATCH UPSERT: %d rows in %.0fms", len(rows), elapsed_ms)
     
     return len(rows)
 
@@ -1018,15 +878,15 @@ def batch_upsert_resources(rows: list, *, conn, chunk_size: int = 500) -> int:
 def get_all_resources() -> List[Dict[str, Any]]:
     """Get all resources."""
     rows = execute("SELECT * FROM resources ORDER BY relative_path", fetch="all")
-    return [dict(row) for row in rows] if rows else []
+    return rows if rows else []  # RealDictRow is already a dict subclass
 
 
 def get_resources_by_scrub_status(statuses: List[str]) -> List[Dict[str, Any]]:
     """Get resources filtered by scrub status."""
-    placeholders = ",".join("?" * len(statuses))
+    # = ANY(array) keeps the SQL text constant for any number of statuses
     rows = execute(
-        f"SELECT * FROM resources WHERE scrub_status IN ({placeholders})",
-        tuple(statuses),
+        "SELECT * FROM resources WHERE scrub_status = ANY(?)",
+        (list(statuses),),
         fetch="all"
     )
     return [dict(row) for row in rows] if rows else []
@@ -1042,7 +902,8 @@ def update_resource_scrub(
     audience: str = None,
     expected_version: int = None,
     reviewed_by: str = None,
-    conn = None
+    conn = None,
+    now: str = None
 ) -> bool:
     """
     Update scrubbing fields for a resource with optimistic locking.
@@ -1058,6 +919,7 @@ def update_resource_scrub(
         expected_version: If provided, only update if version matches (optimistic locking)
         reviewed_by: Username of who made this review (for audit trail)
         conn: Database connection (for transaction support)
+        now: ISO timestamp to stamp; bulk callers pass one value for the whole batch
     
     Returns:
         True if update succeeded, False if version conflict
@@ -1065,16 +927,13 @@ def update_resource_scrub(
     Raises:
         ValueError: If decision is invalid
     """
-    import json
-    from services.scrub_rules import VALID_SCRUB_DECISIONS
-    
     # Validation: decision required and valid
     if decision not in VALID_SCRUB_DECISIONS:
         raise ValueError(f"Invalid scrub decision: {decision}. Must be one of {VALID_SCRUB_DECISIONS}")
     
     # Reasons are deprecated in new workflow, just serialize if provided
     reasons_json = json.dumps(sorted(reasons)) if reasons else None
-    now = datetime.now(timezone.utc).isoformat()
+    now = now or datetime.now(timezone.utc).isoformat()
     
     # Build update dynamically based on provided values
     updates = [
@@ -1138,7 +997,8 @@ def update_resource_invest(
     notes: str = None,
     expected_version: int = None,
     reviewed_by: str = None,
-    conn = None
+    conn = None,
+    now: str = None
 ) -> bool:
     """
     Update investment fields for a resource with optimistic locking.
@@ -1153,11 +1013,12 @@ def update_resource_invest(
         expected_version: For optimistic locking
         reviewed_by: Username making the change
         conn: Optional connection from transaction context
+        now: ISO timestamp to stamp; bulk callers pass one value for the whole batch
     
     Returns:
         True if update succeeded, False if version conflict
     """
-    now = datetime.now(timezone.utc).isoformat()
+    now = now or datetime.now(timezone.utc).isoformat()
     
     if expected_version is not None:
         execute("""
@@ -1211,19 +1072,18 @@ def update_audience_bulk(resource_keys: list, audience: str) -> int:
     if not resource_keys:
         return 0  # Handle empty selection safely
     
-    placeholders = ",".join("?" * len(resource_keys))
-    
     # Note: We need rowcount, so use manual connection with proper cleanup
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            cursor.execute(adapt_query(f"""
+            # Constant SQL text (array param) - adapted once, then memoized
+            cursor.execute(adapt_query("""
                 UPDATE resources
                 SET audience = ?
-                WHERE resource_key IN ({placeholders})
+                WHERE resource_key = ANY(?)
                   AND is_archived = 0 
                   AND is_placeholder = 0
-            """), tuple([audience] + list(resource_keys)))
+            """), (audience, list(resource_keys)))
             count = cursor.rowcount
             conn.commit()
             return count
@@ -1245,41 +1105,45 @@ def update_scrub_batch(updates: dict) -> int:
     
     Returns: count of rows updated
     """
-    from services.scrub_rules import SCRUB_FIELD_WHITELIST
-    
     if not updates:
         return 0
     
     now = datetime.utcnow().isoformat()
     total_updated = 0
     
+    # Group rows by the (whitelisted) field set they touch, so each group
+    # becomes one UPDATE ... FROM (VALUES ...) instead of one UPDATE per row.
+    groups: Dict[tuple, list] = {}
+    for resource_key, fields in updates.items():
+        # Validate fields against whitelist
+        field_names = tuple(sorted(k for k in fields if k in SCRUB_FIELD_WHITELIST))
+        if not field_names:
+            continue
+        groups.setdefault(field_names, []).append(
+            (resource_key, *(fields[f] for f in field_names), now)
+        )
+    
+    if not groups:
+        return 0
+    
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            for resource_key, fields in updates.items():
-                # Validate fields against whitelist
-                safe_fields = {k: v for k, v in fields.items() if k in SCRUB_FIELD_WHITELIST}
-                
-                if not safe_fields:
-                    continue
-                
-                # Build parameterized update
-                set_clauses = [f"{field} = ?" for field in safe_fields.keys()]
-                set_clauses.append("scrub_updated = ?")
-                
-                params = list(safe_fields.values())
-                params.append(now)
-                params.append(resource_key)
-                
-                cursor.execute(adapt_query(f"""
+            for field_names, rows in groups.items():
+                set_clauses = [f"{field} = v.{field}" for field in field_names]
+                set_clauses.append("scrub_updated = v.scrub_updated")
+                sql = f"""
                     UPDATE resources SET
                         {', '.join(set_clauses)}
-                    WHERE resource_key = ?
-                      AND is_archived = 0
-                      AND is_placeholder = 0
-                """), tuple(params))
-                
-                total_updated += cursor.rowcount
+                    FROM (VALUES %s) AS v(resource_key, {', '.join(field_names)}, scrub_updated)
+                    WHERE resources.resource_key = v.resource_key
+                      AND resources.is_archived = 0
+                      AND resources.is_placeholder = 0
+                """
+                # Page manually so rowcount can be summed per statement
+                for i in range(0, len(rows), 500):
+                    execute_values(cursor, sql, rows[i:i + 500], page_size=500)
+                    total_updated += cursor.rowcount
             
             conn.commit()
     finally:
@@ -1305,83 +1169,72 @@ def get_resource_totals(departments: List[str] = None) -> Dict[str, Any]:
     """
     base_filter = "is_archived = 0 AND is_placeholder = 0"
     
+    # Portfolio scope: selected departments plus not_sure (NULL department)
+    if departments:
+        dept_list = list(departments)
+        portfolio_scope = "(primary_department = ANY(?) OR primary_department IS NULL)"
+        portfolio_params = (dept_list, dept_list)
+        # Short explicit list: one index probe per department (LATERAL)
+        # instead of grouping the whole active set
+        dept_query = f"""
+            SELECT d.primary_department, t.total
+            FROM (SELECT DISTINCT unnest(?::text[]) AS primary_department) d
+            CROSS JOIN LATERAL (
+                SELECT SUM(resource_count) as total, COUNT(*) as cnt
+                FROM resources
+                WHERE {base_filter} AND resources.primary_department = d.primary_department
+            ) t
+            WHERE t.cnt > 0
+        """
+        dept_params = (dept_list,)
+    else:
+        portfolio_scope = "TRUE"
+        portfolio_params = ()
+        dept_query = f"""
+            SELECT primary_department, SUM(resource_count) as total
+            FROM resources
+            WHERE {base_filter} AND primary_department IS NOT NULL
+            GROUP BY primary_department
+        """
+        dept_params = ()
+    
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            # Portfolio totals by bucket
-            if departments:
-                placeholders = ",".join("?" * len(departments))
-                cursor.execute(adapt_query(f"""
-                    SELECT bucket, SUM(resource_count) as total
-                    FROM resources
-                    WHERE {base_filter} AND (primary_department IN ({placeholders}) OR primary_department IS NULL)
-                    GROUP BY bucket
-                """), tuple(departments))
-            else:
-                cursor.execute(f"""
-                    SELECT bucket, SUM(resource_count) as total
-                    FROM resources
-                    WHERE {base_filter}
-                    GROUP BY bucket
-                """)
-            bucket_totals = {row['bucket']: row['total'] for row in cursor.fetchall()}
-            
-            # Department breakdown
-            if departments:
-                placeholders = ",".join("?" * len(departments))
-                cursor.execute(adapt_query(f"""
-                    SELECT primary_department, SUM(resource_count) as total
-                    FROM resources
-                    WHERE {base_filter} AND primary_department IN ({placeholders})
-                    GROUP BY primary_department
-                """), tuple(departments))
-            else:
-                cursor.execute(f"""
-                    SELECT primary_department, SUM(resource_count) as total
-                    FROM resources
-                    WHERE {base_filter} AND primary_department IS NOT NULL
-                    GROUP BY primary_department
-                """)
-            dept_totals = {row['primary_department']: row['total'] for row in cursor.fetchall()}
-            
-            # Not sure backlog
-            cursor.execute(f"""
-                SELECT COUNT(*) as count, SUM(resource_count) as total
-                FROM resources
-                WHERE {base_filter} AND primary_department IS NULL
-            """)
-            not_sure = cursor.fetchone()
-            
-            # Scrubbing progress
-            cursor.execute(f"""
-                SELECT 
+            # Portfolio buckets, not_sure backlog, scrubbing progress and
+            # investment queue in one scan (each with its own FILTER)
+            cursor.execute(adapt_query(f"""
+                SELECT
+                    SUM(resource_count) FILTER (WHERE bucket = 'onboarding' AND {portfolio_scope}) as onboarding,
+                    SUM(resource_count) FILTER (WHERE bucket = 'upskilling' AND {portfolio_scope}) as upskilling,
+                    COUNT(*) FILTER (WHERE primary_department IS NULL) as not_sure_count,
+                    SUM(resource_count) FILTER (WHERE primary_department IS NULL) as not_sure_total,
                     COUNT(*) as total,
-                    SUM(CASE WHEN scrub_status != 'not_reviewed' THEN 1 ELSE 0 END) as reviewed
+                    COUNT(*) FILTER (WHERE scrub_status != 'not_reviewed') as reviewed,
+                    COUNT(*) FILTER (WHERE scrub_status IN ('modify', 'gap')) as invest_count
                 FROM resources
                 WHERE {base_filter}
-            """)
-            scrub = cursor.fetchone()
+            """), portfolio_params)
+            totals = cursor.fetchone()
             
-            # Investment queue
-            cursor.execute(f"""
-                SELECT COUNT(*) as count
-                FROM resources
-                WHERE {base_filter} AND scrub_status IN ('modify', 'gap')
-            """)
-            invest = cursor.fetchone()
+            # Department breakdown
+            cursor.execute(adapt_query(dept_query), dept_params)
+            dept_totals = {row['primary_department']: row['total'] for row in cursor.fetchall()}
     finally:
         return_connection(conn)
     
+    total = totals['total'] or 0
+    reviewed = totals['reviewed'] or 0
     return {
-        'onboarding': bucket_totals.get('onboarding', 0) or 0,
-        'upskilling': bucket_totals.get('upskilling', 0) or 0,
-        'not_sure': not_sure['total'] or 0,
-        'not_sure_count': not_sure['count'] or 0,
+        'onboarding': totals['onboarding'] or 0,
+        'upskilling': totals['upskilling'] or 0,
+        'not_sure': totals['not_sure_total'] or 0,
+        'not_sure_count': totals['not_sure_count'] or 0,
         'dept_breakdown': dept_totals,
-        'total_containers': scrub['total'] or 0,
-        'reviewed_containers': scrub['reviewed'] or 0,
-        'scrubbing_pct': (scrub['reviewed'] / scrub['total'] * 100) if scrub['total'] else 0,
-        'investment_queue': invest['count'] or 0,
+        'total_containers': total,
+        'reviewed_containers': reviewed,
+        'scrubbing_pct': (reviewed / total * 100) if total else 0,
+        'investment_queue': totals['invest_count'] or 0,
     }
 
 
@@ -1394,8 +1247,14 @@ def get_latest_snapshot() -> Optional[Dict[str, Any]]:
 
 
 def clear_containers() -> None:
-    """Clear all containers. For testing/reset only."""
-    execute("DELETE FROM resources")
+    """
+    Clear all containers. For testing/reset only.
+
+    TRUNCATE drops the table's pages outright instead of scanning and
+    WAL-logging every row like DELETE. Nothing references resources via
+    foreign key and it has no sequence, so no CASCADE / RESTART IDENTITY.
+    """
+    execute("TRUNCATE TABLE resources")
 
 
 # -----------------------------------------------------------------------------
@@ -1555,7 +1414,35 @@ def get_active_containers() -> List[Dict[str, Any]]:
         WHERE is_archived = 0 AND is_placeholder = 0
         ORDER BY relative_path
     """, fetch="all")
-    return [dict(row) for row in rows] if rows else []
+    return rows if rows else []  # RealDictRow is already a dict subclass
+
+
+# Columns a caller may project in the filtered listing queries.
+# Must list every resources column in _INIT_DB_SQL (CREATE + ALTERs);
+# tests/test_resource_columns.py checks this.
+_RESOURCE_COLUMNS = frozenset({
+    "resource_key", "drive_item_id", "relative_path", "bucket",
+    "primary_department", "sub_department", "training_type", "resource_type",
+    "display_name", "web_url", "resource_count", "valid_link_count",
+    "contents_count", "is_placeholder", "scrub_status", "scrub_notes",
+    "scrub_owner", "scrub_updated", "invest_decision", "invest_owner",
+    "invest_effort", "invest_notes", "invest_updated", "first_seen",
+    "last_seen", "source", "is_archived", "audience",
+    "approved_for_investment", "scrub_reasons", "sales_stage",
+    # Added by ALTER TABLE in _INIT_DB_SQL
+    "scrub_version", "invest_version", "last_reviewed_by",
+    "invest_cost", "invest_modified_at", "invest_modified_by",
+})
+
+
+def _select_list(columns: Optional[Tuple[str, ...]]) -> str:
+    """Build a SELECT list from whitelisted column names ('*' when None)."""
+    if not columns:
+        return "*"
+    invalid = set(columns) - _RESOURCE_COLUMNS
+    if invalid:
+        raise ValueError(f"Invalid columns: {sorted(invalid)}")
+    return ", ".join(columns)
 
 
 def get_active_containers_filtered(
@@ -1669,7 +1556,8 @@ def get_active_training_types(primary_department: str = None) -> List[str]:
 def get_active_resources_filtered(
     primary_department: str = None,
     training_type: str = None,
-    sales_stage: str = None
+    sales_stage: str = None,
+    columns: Tuple[str, ...] = None
 ) -> List[Dict[str, Any]]:
     """
     Get active RESOURCES (file/link only, excludes folders) with optional filters.
@@ -1677,9 +1565,12 @@ def get_active_resources_filtered(
     For Inventory page use. Dashboard and other pages use get_active_containers().
     
     Canonical predicate: is_archived=0 AND is_placeholder=0 AND resource_type IN ('file','link')
+    
+    Pass columns to select only the fields the caller renders (default: all);
+    names outside _RESOURCE_COLUMNS raise ValueError.
     """
-    query = """
-        SELECT * FROM resources 
+    query = f"""
+        SELECT {_select_list(columns)} FROM resources 
         WHERE is_archived = 0 AND is_placeholder = 0
           AND resource_type IN ('file', 'link')
     """
@@ -1702,10 +1593,35 @@ def get_active_resources_filtered(
     query += " ORDER BY relative_path"
     
     rows = execute(query, tuple(params) if params else None, fetch="all")
-    return [dict(row) for row in rows] if rows else []
+    return rows if rows else []  # RealDictRow is already a dict subclass
 
 
 @cached(30)
+def _load_active_resource_facets() -> List[tuple]:
+    """
+    Load distinct (department, training_type) pairs for the Inventory filters.
+    
+    One query feeds both get_active_resource_departments() and
+    get_active_resource_training_types(), which the Inventory page calls
+    together. Departments from the departments table (folder-aware sync)
+    come back with a NULL training type.
+    
+    Returns:
+        List of (primary_department, training_type) tuples ordered by department
+    """
+    rows = execute("""
+        SELECT DISTINCT primary_department, training_type
+        FROM resources
+        WHERE is_archived = 0 AND is_placeholder = 0
+          AND resource_type IN ('file', 'link')
+        UNION
+        SELECT department AS primary_department, NULL AS training_type
+        FROM departments
+        ORDER BY primary_department
+    """, fetch="all")
+    return [(row['primary_department'], row['training_type']) for row in rows] if rows else []
+
+
 def get_active_resource_departments() -> List[str]:
     """
     Get distinct departments from active RESOURCES (file/link only)
@@ -1714,46 +1630,22 @@ def get_active_resource_departments() -> List[str]:
     For Inventory/Investment/Directory filter dropdowns.
     Includes departments from folder structure even if they have zero resources.
     """
-    rows = execute("""
-        SELECT DISTINCT dept FROM (
-            SELECT primary_department AS dept
-            FROM resources
-            WHERE is_archived = 0 AND is_placeholder = 0
-              AND resource_type IN ('file', 'link')
-              AND primary_department IS NOT NULL
-            UNION
-            SELECT department AS dept
-            FROM departments
-        ) combined
-        ORDER BY dept
-    """, fetch="all")
-    return [row['dept'] for row in rows] if rows else []
+    facets = _load_active_resource_facets()
+    return list(dict.fromkeys(dept for dept, _ in facets if dept is not None))
 
 
-@cached(30)
 def get_active_resource_training_types(primary_department: str = None) -> List[str]:
     """
     Get distinct training types from active RESOURCES (file/link only).
     
     For Inventory filter dropdown. Excludes training types that only exist on folders.
     """
-    query = """
-        SELECT DISTINCT training_type
-        FROM resources
-        WHERE is_archived = 0 AND is_placeholder = 0
-          AND resource_type IN ('file', 'link')
-          AND training_type IS NOT NULL
-    """
-    params = []
-    
-    if primary_department:
-        query += " AND primary_department = ?"
-        params.append(primary_department)
-    
-    query += " ORDER BY training_type"
-    
-    rows = execute(query, tuple(params) if params else None, fetch="all")
-    return [row['training_type'] for row in rows] if rows else []
+    facets = _load_active_resource_facets()
+    return sorted({
+        training_type for dept, training_type in facets
+        if training_type is not None
+        and (not primary_department or dept == primary_department)
+    })
 
 
 # -----------------------------------------------------------------------------
@@ -1772,8 +1664,6 @@ def update_sales_stage(resource_key: str, stage: str | None, conn = None) -> Non
     Raises:
         ValueError: If stage is not None and not a valid canonical key
     """
-    from services.sales_stage import SALES_STAGE_KEYS
-    
     if stage is not None and stage not in SALES_STAGE_KEYS:
         raise ValueError(f"Invalid sales_stage: {stage}")
     
@@ -1795,8 +1685,6 @@ def get_sales_stage_breakdown() -> List[Dict]:
     Returns:
         List of dicts with 'stage', 'label', 'count' keys
     """
-    from services.sales_stage import SALES_STAGE_LABELS
-    
     rows = execute("""
         SELECT sales_stage, SUM(resource_count) as count
         FROM resources
@@ -1869,29 +1757,27 @@ def run_audience_migration() -> Dict[str, Any]:
             diagnostics = [(row['primary_department'], row['cnt']) for row in cursor.fetchall()]
             
             # Step 2: Backfill audience from primary_department with normalization
-            backfill_count = 0
-            
-            # For each key in AUDIENCE_MAP, update rows
-            for old_val, canonical_val in AUDIENCE_MAP.items():
-                cursor.execute(adapt_query("""
-                    UPDATE resources
-                    SET audience = ?
-                    WHERE (audience IS NULL OR audience = '')
-                    AND primary_department = ?
-                """), (canonical_val, old_val))
-                backfill_count += cursor.rowcount
+            # One UPDATE joined against AUDIENCE_MAP as an inline VALUES table
+            backfill_pairs = list(AUDIENCE_MAP.items())
+            execute_values(cursor, """
+                UPDATE resources
+                SET audience = m.canonical
+                FROM (VALUES %s) AS m(src, canonical)
+                WHERE (resources.audience IS NULL OR resources.audience = '')
+                AND resources.primary_department = m.src
+            """, backfill_pairs, page_size=len(backfill_pairs))
+            backfill_count = cursor.rowcount
             
             # Step 3: Cleanup any snake_case values already written to audience column
             snake_case_keys = ['direct', 'indirect', 'fi', 'partner_management', 'operations', 'compliance', 'integration']
-            cleanup_count = 0
-            for old_val in snake_case_keys:
-                canonical_val = AUDIENCE_MAP[old_val]
-                cursor.execute(adapt_query("""
-                    UPDATE resources
-                    SET audience = ?
-                    WHERE audience = ?
-                """), (canonical_val, old_val))
-                cleanup_count += cursor.rowcount
+            cleanup_pairs = [(old_val, AUDIENCE_MAP[old_val]) for old_val in snake_case_keys]
+            execute_values(cursor, """
+                UPDATE resources
+                SET audience = m.canonical
+                FROM (VALUES %s) AS m(src, canonical)
+                WHERE resources.audience = m.src
+            """, cleanup_pairs, page_size=len(cleanup_pairs))
+            cleanup_count = cursor.rowcount
             
             # Count remaining NULL
             cursor.execute("""
@@ -1939,8 +1825,6 @@ def get_scrub_rollups() -> Dict[str, Any]:
     
     Uses SUM(resource_count) for proper reconciliation with inventory totals.
     """
-    import json
-    
     # By decision (use SUM(resource_count))
     decision_rows = execute("""
         SELECT scrub_status, 
@@ -1955,23 +1839,22 @@ def get_scrub_rollups() -> Dict[str, Any]:
         for row in decision_rows
     } if decision_rows else {}
     
-    # By reason (parse JSON, accumulate resource_count)
+    # By reason (unnest the JSON array server-side, one row per reason)
     reason_rows = execute("""
-        SELECT scrub_reasons, resource_count FROM resources
+        SELECT reason,
+               COUNT(*) as cnt,
+               COALESCE(SUM(resource_count), 0) as total
+        FROM resources
+        CROSS JOIN LATERAL jsonb_array_elements_text(scrub_reasons::jsonb) AS reason
         WHERE is_archived = 0 AND is_placeholder = 0 
           AND scrub_status IN ('HOLD', 'BLOCK')
           AND scrub_reasons IS NOT NULL AND scrub_reasons != ''
+        GROUP BY reason
     """, fetch="all")
-    reason_counts = {}
-    if reason_rows:
-        for row in reason_rows:
-            reasons = json.loads(row['scrub_reasons'] or '[]')
-            rc = row['resource_count'] if row['resource_count'] is not None else 0
-            for r in reasons:
-                if r not in reason_counts:
-                    reason_counts[r] = {'count': 0, 'resources': 0}
-                reason_counts[r]['count'] += 1
-                reason_counts[r]['resources'] += rc
+    reason_counts = {
+        row['reason']: {'count': row['cnt'], 'resources': row['total']}
+        for row in reason_rows
+    } if reason_rows else {}
     
     return {'by_decision': by_decision, 'by_reason': reason_counts}
 
@@ -2228,6 +2228,7 @@ CURRENT CONTEXT:
         updates = action.get('updates', {})
         
         count = 0
+        now = datetime.now(timezone.utc).isoformat()  # One timestamp per action
         with db.transaction() as conn:
             for key in keys:
                 if action_type == 'scrub':
@@ -2239,7 +2240,8 @@ CURRENT CONTEXT:
                         reasons=[updates['scrub_reason']] if updates.get('scrub_reason') else None,
                         audience=updates.get('audience'),
                         reviewed_by=self.username,
-                        conn=conn
+                        conn=conn,
+                        now=now
                     )
                 elif action_type == 'invest':
                     db.update_resource_invest(
@@ -2249,7 +2251,8 @@ CURRENT CONTEXT:
                         effort=updates.get('invest_effort'),
                         notes=updates.get('invest_notes'),
                         reviewed_by=self.username,
-                        conn=conn
+                        conn=conn,
+                        now=now
                     )
                 elif action_type == 'sales_stage':
                     db.update_sales_stage(key, updates.get('sales_stage'), conn=conn)
@@ -20,20 +20,24 @@ VALID_SCRUB_DECISIONS = frozenset({
 })
 
 
+# Stored status -> canonical display value (built once; normalize_status is
+# called several times per container on dashboard renders). Unreviewed
+# sentinels are keys too, so the lookup needs no separate branch.
+_STATUS_DISPLAY_MAP = {
+    None: 'Unreviewed', '': 'Unreviewed', 'not_reviewed': 'Unreviewed',
+    'PASS': 'Include', 'Include': 'Include',
+    'HOLD': 'Modify', 'Modify': 'Modify', 'modify': 'Modify', 'gap': 'Modify',
+    'BLOCK': 'Sunset', 'Sunset': 'Sunset',
+}
+
+
 def normalize_status(raw: Optional[str]) -> str:
     """
     Map any stored status to canonical display value.
     
     Returns one of: 'Unreviewed', 'Include', 'Modify', 'Sunset', 'LegacyUnknown'
     """
-    if raw is None or raw == '' or raw == 'not_reviewed':
-        return 'Unreviewed'
-    mapping = {
-        'PASS': 'Include', 'Include': 'Include',
-        'HOLD': 'Modify', 'Modify': 'Modify', 'modify': 'Modify', 'gap': 'Modify',
-        'BLOCK': 'Sunset', 'Sunset': 'Sunset',
-    }
-    return mapping.get(raw, 'LegacyUnknown')
+    return _STATUS_DISPLAY_MAP.get(raw, 'LegacyUnknown')
 
 
 # Valid scrub reasons - kept for backwards compatibility
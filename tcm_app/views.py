@@ -16,6 +16,17 @@ from django.contrib import messages
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 
+import re
+
+# Leading ordinal on bucket folder names, e.g. "01_Onboarding" / "2 - Upskilling"
+_BUCKET_PREFIX_RE = re.compile(r'^\d+\s*[_-]\s*')
+
+# Columns rendered by inventory.html (plus resource_count for the total)
+_INVENTORY_COLUMNS = (
+    'resource_key', 'display_name', 'resource_type', 'relative_path',
+    'audience', 'contents_count', 'resource_count',
+)
+
 # =============================================================================
 # AUTH VIEWS
 # =============================================================================
@@ -142,7 +153,6 @@ def dashboard_view(request):
     - Decision bar: collapse if all 0
     - No Training Sources
     """
-    import re
     from collections import defaultdict
     from db import get_active_containers, get_sales_stage_breakdown
     from services.scrub_rules import normalize_status, CANONICAL_AUDIENCES
@@ -160,7 +170,7 @@ def dashboard_view(request):
     def normalize_bucket(raw: str) -> str:
         """Normalize bucket field to 'onboarding', 'upskilling', or ''."""
         s = (raw or '').strip().lower()
-        s = re.sub(r'^\d+\s*[_-]\s*', '', s)
+        s = _BUCKET_PREFIX_RE.sub('', s)
         if s.startswith('onboarding'):
             return 'onboarding'
         if s.startswith('upskilling'):
@@ -463,6 +473,7 @@ def inventory_view(request):
         primary_department=department if department else None,
         training_type=training_type if training_type else None,
         sales_stage=sales_stage if sales_stage else None,
+        columns=_INVENTORY_COLUMNS,
     )
     
     # Apply audience filter client-side (filter not applied at SQL level)
@@ -927,6 +938,7 @@ def save_scrub_batch_view(request):
     - For each key: status_{key}, audience_{key}, stage_{key}, notes_{key}
     - queue_filter: current filter for redirect
     """
+    from datetime import datetime, timezone
     from db import update_resource_scrub, update_sales_stage, transaction, execute
     from services.scrub_rules import VALID_SCRUB_DECISIONS, CANONICAL_AUDIENCES
     from services.sales_stage import SALES_STAGE_KEYS
@@ -1058,6 +1070,7 @@ def save_scrub_batch_view(request):
     
     try:
         with transaction() as conn:
+            now = datetime.now(timezone.utc).isoformat()  # One timestamp per save
             for row in validated_rows:
                 version_key = f"version_{row['resource_key']}"
                 expected_version_str = request.POST.get(version_key)
@@ -1074,6 +1087,7 @@ def save_scrub_batch_view(request):
                     expected_version=expected_version,
                     reviewed_by=request.user.username,  # Audit trail
                     conn=conn,
+                    now=now,
                 )
                 
                 update_sales_stage(
@@ -1241,6 +1255,7 @@ def save_investment_batch_view(request):
     - All-or-nothing: if any row fails validation or has conflict, no rows persist
     - Wrapped in database transaction
     """
+    from datetime import datetime, timezone
     from db import update_resource_invest, transaction, execute
     from models.enums import InvestDecision, InvestEffort, InvestCost
     
@@ -1323,6 +1338,7 @@ def save_investment_batch_view(request):
     persisted_count = 0
     try:
         with transaction() as conn:
+            now = datetime.now(timezone.utc).isoformat()  # One timestamp per save
             for row in validated_rows:
                 version_key = f"version_{row['resource_key']}"
                 expected_version_str = request.POST.get(version_key)
@@ -1338,6 +1354,7 @@ def save_investment_batch_view(request):
                     expected_version=expected_version,
                     reviewed_by=request.user.username,
                     conn=conn,
+                    now=now,
                 )
                 persisted_count += 1
     except Exception as e:
@@ -234,5 +234,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'db': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -7,6 +7,25 @@ Must NOT corrupt placeholders inside quotes or comments.
 This test is self-contained - does not import db.py to avoid psycopg2 dependency.
 """
 
+import re
+
+
+# One left-to-right scan: quoted strings/identifiers and comments are matched
+# (and kept verbatim) before a bare '?' can be. Unterminated quotes/comments
+# run to end of input, same as the previous char-by-char state machine.
+_ADAPT_QUERY_RE = re.compile(
+    r"'(?:[^']|'')*(?:'|\Z)"       # single-quoted string ('' escapes)
+    r'|"(?:[^"]|"")*(?:"|\Z)'      # double-quoted identifier ("" escapes)
+    r"|--[^\n]*"                   # line comment
+    r"|/\*.*?(?:\*/|\Z)"           # block comment
+    r"|(\?)",                      # placeholder (group 1)
+    re.DOTALL,
+)
+
+
+def _adapt_query_sub(m) -> str:
+    return "%s" if m.group(1) else m.group(0)
+
 
 def adapt_query(sql: str) -> str:
     """
@@ -17,92 +36,9 @@ def adapt_query(sql: str) -> str:
       - line comments: -- ...
       - block comments: /* ... */
     """
-    if not sql:
-        return sql
-
-    out = []
-    i = 0
-    n = len(sql)
-
-    in_single = False
-    in_double = False
-    in_line_comment = False
-    in_block_comment = False
-
-    while i < n:
-        ch = sql[i]
-
-        # End line comment
-        if in_line_comment:
-            out.append(ch)
-            if ch == "\n":
-                in_line_comment = False
-            i += 1
-            continue
-
-        # End block comment
-        if in_block_comment:
-            out.append(ch)
-            if ch == "*" and i + 1 < n and sql[i + 1] == "/":
-                out.append("/")
-                i += 2
-                in_block_comment = False
-            else:
-                i += 1
-            continue
-
-        # Start comments (only if not in quotes)
-        if not in_single and not in_double:
-            if ch == "-" and i + 1 < n and sql[i + 1] == "-":
-                out.append(ch)
-                out.append("-")
-                i += 2
-                in_line_comment = True
-                continue
-            if ch == "/" and i + 1 < n and sql[i + 1] == "*":
-                out.append(ch)
-                out.append("*")
-                i += 2
-                in_block_comment = True
-                continue
-
-        # Handle quotes
-        if ch == "'" and not in_double:
-            out.append(ch)
-            if in_single:
-                if i + 1 < n and sql[i + 1] == "'":
-                    out.append("'")
-                    i += 2
-                    continue
-                in_single = False
-            else:
-                in_single = True
-            i += 1
-            continue
-
-        if ch == '"' and not in_single:
-            out.append(ch)
-            if in_double:
-                if i + 1 < n and sql[i + 1] == '"':
-                    out.append('"')
-                    i += 2
-                    continue
-                in_double = False
-            else:
-                in_double = True
-            i += 1
-            continue
-
-        # Replace placeholder only when not in quotes/comments
-        if ch == "?" and not in_single and not in_double:
-            out.append("%s")
-            i += 1
-            continue
-
-        out.append(ch)
-        i += 1
-
-    return "".join(out)
+    if not sql or "?" not in sql:
+        return sql  # Nothing to convert - skip the scan
+    return _ADAPT_QUERY_RE.sub(_adapt_query_sub, sql)
 
 
 def test_simple():
@@ -162,6 +98,18 @@ def test_none():
     assert adapt_query(None) is None
 
 
+def test_unterminated_string():
+    """Unterminated literal runs to end of input - nothing after it is converted."""
+    result = adapt_query("SELECT * WHERE id = ? AND name = 'oops?")
+    assert result == "SELECT * WHERE id = %s AND name = 'oops?"
+
+
+def test_no_placeholder():
+    """SQL without any '?' is returned unchanged (same object)."""
+    sql = "SELECT * FROM t WHERE name = 'it''s' -- note\n"
+    assert adapt_query(sql) is sql
+
+
 if __name__ == "__main__":
     # Run all tests
     test_simple()
@@ -194,6 +142,12 @@ if __name__ == "__main__":
     test_none()
     print("PASS: test_none")
     
+    test_unterminated_string()
+    print("PASS: test_unterminated_string")
+    
+    test_no_placeholder()
+    print("PASS: test_no_placeholder")
+    
     print("\n" + "="*50)
     print("ALL TESTS PASSED")
     print("="*50)
@@ -0,0 +1,88 @@
+"""
+Tests for is_write() function.
+
+Regression cover for CTE write detection: a write keyword inside a WITH
+query must be found even when it follows a newline or ')' rather than a
+space, and column names that merely contain a keyword must not match.
+
+Run: pytest tests/test_is_write.py -v
+"""
+
+import sys
+import os
+import importlib.util
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+# db imports are deferred to function scope: importing db needs psycopg2,
+# and a module-level import would abort collection of the whole suite
+
+# Skip marker - db.py imports psycopg2 at module level (no connection is made)
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("psycopg2") is None,
+    reason="Requires psycopg2 (imported by db.py)"
+)
+
+
+def test_cte_write_after_newline():
+    """UPDATE on its own line after the CTE body is a write."""
+    from db import is_write
+    
+    sql = "WITH stale AS (\n    SELECT resource_key FROM resources\n)\nUPDATE resources SET is_archived = 1"
+    assert is_write(sql) is True
+
+
+def test_cte_write_after_paren():
+    """A data-modifying CTE (DELETE right after '(') is a write."""
+    from db import is_write
+    
+    sql = "WITH moved AS (DELETE FROM resources WHERE is_archived = 1 RETURNING *) SELECT * FROM moved"
+    assert is_write(sql) is True
+
+
+def test_cte_keyword_inside_identifier_is_not_write():
+    """scrub_updated / created_at contain UPDATE / CREATE but are not writes."""
+    from db import is_write
+    
+    sql = "WITH recent AS (SELECT scrub_updated, created_at FROM resources) SELECT * FROM recent"
+    assert is_write(sql) is False
+
+
+def test_cte_read_with_keyword_is_conservatively_write():
+    """
+    Read-only CTEs that contain a whole-word write keyword are classified
+    as writes - by design, not by accident.
+    
+    The CTE scan is a word-bounded keyword search; it does not parse SQL, so
+    it cannot tell FOR UPDATE or a 'delete' literal from a real write. Erring
+    toward "write" only costs an extra COMMIT in execute(); erring the other
+    way would silently drop a real write.
+    """
+    from db import is_write
+    
+    assert is_write("WITH r AS (SELECT * FROM resources) SELECT * FROM r FOR UPDATE") is True
+    assert is_write("WITH r AS (SELECT * FROM resources WHERE scrub_notes = 'delete') SELECT * FROM r") is True
+
+
+def test_plain_select_is_not_write():
+    """A plain SELECT is read-only."""
+    from db import is_write
+    
+    assert is_write("SELECT * FROM resources WHERE is_archived = 0") is False
+
+
+def test_plain_write_statements():
+    """Leading write keywords are detected regardless of case or indentation."""
+    from db import is_write
+    
+    assert is_write("  insert INTO departments (department) VALUES (?)") is True
+    assert is_write("\nTRUNCATE TABLE resources") is True
+
+
+def test_empty():
+    """Empty / whitespace-only SQL is not a write."""
+    from db import is_write
+    
+    assert is_write("") is False
+    assert is_write("   ") is False
@@ -0,0 +1,61 @@
+"""
+Tests for the _RESOURCE_COLUMNS projection whitelist.
+
+The whitelist is hand-maintained next to get_active_resources_filtered();
+these tests fail when a column is added to (or dropped from) the resources
+schema in _INIT_DB_SQL without updating it.
+
+Run: pytest tests/test_resource_columns.py -v
+"""
+
+import sys
+import os
+import re
+import importlib.util
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+# db imports are deferred to function scope: importing db needs psycopg2,
+# and a module-level import would abort collection of the whole suite
+
+# Skip marker - db.py imports psycopg2 at module level (no connection is made)
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("psycopg2") is None,
+    reason="Requires psycopg2 (imported by db.py)"
+)
+
+
+def _schema_resource_columns(init_sql: str) -> set:
+    """Column names of resources from its CREATE TABLE plus every ADD COLUMN."""
+    create = re.search(
+        r"CREATE TABLE IF NOT EXISTS resources \((.*?)\n\);", init_sql, re.DOTALL
+    )
+    assert create, "resources CREATE TABLE not found in _INIT_DB_SQL"
+    columns = set(re.findall(r"^\s*(\w+)\s+[A-Z]", create.group(1), re.MULTILINE))
+    columns.update(re.findall(
+        r"ALTER TABLE resources ADD COLUMN IF NOT EXISTS (\w+)", init_sql
+    ))
+    return columns
+
+
+def test_whitelist_matches_schema():
+    """_RESOURCE_COLUMNS lists exactly the resources columns created/altered in init_db."""
+    import db
+    
+    assert db._RESOURCE_COLUMNS == _schema_resource_columns(db._INIT_DB_SQL)
+
+
+def test_migration_columns_projectable():
+    """Columns added by ALTER TABLE (e.g. scrub_version) can be selected."""
+    import db
+    
+    assert db._select_list(("resource_key", "scrub_version")) == "resource_key, scrub_version"
+
+
+def test_unknown_column_rejected():
+    """Names outside the whitelist raise ValueError instead of reaching SQL."""
+    import db
+    
+    with pytest.raises(ValueError):
+        db._select_list(("resource_key", "1; DROP TABLE resources"))